@@ -2,32 +2,53 @@
 apodo.connection
 ~~~~~~~~~~~~~~~~
 
-This module contains the `Connection` class.
+This module contains the `Connection` and `ConnectionList` classes.
 """
 from asyncio import AbstractEventLoop
+from asyncio import BufferedProtocol
 from asyncio import Event
 from asyncio import sleep
 from asyncio import Task
 from asyncio import Transport
-from time import time
+from typing import Awaitable
 from typing import Callable
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
 
 from apodo.net.headers import Headers
-from apodo.server import Server
+from apodo.util.parser import PARSE_OK
 from apodo.util.parser import Parser
 from apodo.util.stream import Stream
 
+if TYPE_CHECKING:
+    from apodo.server import Server
+
 STATUS_PENDING: int = 1
 STATUS_RECEIVING: int = 2
 STATUS_PROCESSING: int = 3
+STATUS_CLOSED: int = 4
+
+RECEIVE_BUFFER_SIZE: int = 65536
+PAUSE_WATERMARK: int = 65536
+WRITE_HIGH_WATERMARK: int = 65536
+WRITE_LOW_WATERMARK: int = 16384
+
+BAD_REQUEST: bytes = (
+    b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+)
 
 
-class Connection:
-    """ Implements the `Connection` class.
+class Connection(BufferedProtocol):
+    """ Implements the `Connection` class, a subclass of `BufferedProtocol`.
 
     This class is instantiated per connection received by the server.
     It controls all transport-level reading and writing operations
-    from and to the client.
+    from and to the client. Incoming data is received directly into a
+    buffer owned by the server and shared by all of its connections.
+    Each read is handed to the parser before the next one starts, and
+    the parser copies out whatever it keeps, so one buffer per worker
+    serves any number of open connections.
 
     Many of the methods in the `Connection` class are callback methods
     for either the network flow or parser flow. They are marked as such
@@ -37,18 +58,55 @@ class Connection:
     Many attributions that would be seen post-initialization would decrease
     performance, and are therefore set during initialization.
 
+    The class only relies on the public protocol and loop APIs, so it runs
+    unchanged on both the stock `asyncio` loop and `uvloop`.
+
     :param server: The current `Server` instance.
     :param loop: An event loop.
     :param protocol: The `bytes` protocol of the connection.
     """
 
-    def __init__(self, server: Server, loop: AbstractEventLoop, protocol: bytes):
-        self.server: Server = server
+    __slots__ = (
+        "server",
+        "loop",
+        "transport",
+        "stream",
+        "parser",
+        "protocol",
+        "status",
+        "writable",
+        "readable",
+        "write_permission",
+        "current_task",
+        "timeout_task",
+        "last_task_time",
+        "keep_alive",
+        "_stopped",
+        "_prev",
+        "_next",
+        "_transport_write",
+        "_transport_writelines",
+        "_transport_pause_reading",
+        "_transport_resume_reading",
+        "_write_permission_wait",
+        "_create_task",
+        "_touch",
+        "_stream_put",
+        "_feed",
+    )
+
+    def __init__(
+        self, server: "Server", loop: AbstractEventLoop, protocol: Optional[bytes]
+    ):
+        self.server: "Server" = server
         self.loop: AbstractEventLoop = loop
+        self._create_task: Callable = loop.create_task
 
         self.transport: Transport = None
         self.stream: Stream = Stream(self)
+        self._stream_put: Callable = self.stream._put
         self.parser: Parser = Parser(self)
+        self._feed: Callable = self.parser.feed_data
 
         self.protocol: bytes = protocol or b"1.1"
 
@@ -56,13 +114,22 @@ class Connection:
         self.writable: bool = True
         self.readable: bool = True
         self.write_permission: Event = Event()
+        self._write_permission_wait: Callable = self.write_permission.wait
         self.current_task: Task = None
         self.timeout_task: Task = None
-        self.closed: bool = False
-        self.last_task_time: time = time()
-        self.keep_alive = True
+        self.last_task_time: float = server.now
+        self._touch: Callable = server.connections.touch
+        self.keep_alive: bool = True
         self._stopped: bool = False
 
+        self._prev: Connection = None
+        self._next: Connection = None
+
+        self._transport_write: Callable = None
+        self._transport_writelines: Callable = None
+        self._transport_pause_reading: Callable = None
+        self._transport_resume_reading: Callable = None
+
     def cancel_request(self):
         """ (NFC) Cancels a current task/request. """
         self.current_task.cancel()
@@ -70,34 +137,69 @@ class Connection:
     def connection_made(self, transport: Transport):
         """ (NFC) Localizes the transport and adds the connection to the server.
 
+        The transport's write buffer limits are set here, so the transport
+        itself calls `pause_writing` and `resume_writing` as its buffer
+        crosses them, and writes never have to check the buffer size.
+
         :param transport: The connection stream's `Transport` object.
         """
         self.transport: Transport = transport
+        transport.set_write_buffer_limits(
+            high=WRITE_HIGH_WATERMARK, low=WRITE_LOW_WATERMARK
+        )
+        self._transport_write = transport.write
+        self._transport_writelines = transport.writelines
+        self._transport_pause_reading = transport.pause_reading
+        self._transport_resume_reading = transport.resume_reading
         self.server.connections.add(self)
 
-    def data_received(self, data: bytes):
-        """ (NFC) Sends received data to the parser.
+    def connection_lost(self, exc: Optional[Exception]):
+        """ (NFC) Marks the connection closed once the transport is gone.
+
+        :param exc: An `Exception` if the connection was lost to an error,
+                    or `None` if it was closed cleanly.
+        """
+        self.close()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """ (NFC) Provides the buffer the transport receives data into.
+
+        :param sizehint: An `int` recommended minimum size for the buffer.
 
-        :param data: A `bytes` representation of the incoming data.
+        :return: A writable `memoryview` over the receive buffer.
+        """
+        server = self.server
+        if sizehint > len(server.recv_buffer):
+            server.recv_buffer = bytearray(sizehint)
+            server.recv_view = memoryview(server.recv_buffer)
+
+        return server.recv_view
+
+    def buffer_updated(self, nbytes: int):
+        """ (NFC) Sends newly received data to the parser.
+
+        Data the parser rejects is answered with `400 Bad Request` before
+        the connection is closed.
+
+        :param nbytes: An `int` count of bytes written into the buffer.
         """
         self.status = STATUS_RECEIVING
 
-        try:
-            self.parser.parse(data)
-        except Exception:
+        if self._feed(self.server.recv_view[:nbytes]) != PARSE_OK:
             self.pause_reading()
+            self._transport_write(BAD_REQUEST)
             self.close()
 
     def pause_reading(self):
         """ (NFC) Pauses the transport reading the stream. """
         if self.readable:
-            self.transport.pause_reading()
+            self._transport_pause_reading()
             self.readable = False
 
     def resume_reading(self):
         """ (NFC) Resumes the transport reading the stream. """
         if not self.readable:
-            self.transport.resume_reading()
+            self._transport_resume_reading()
             self.readable = True
 
     def on_headers_complete(self, headers: Headers, url: bytes, method: bytes):
@@ -107,20 +209,30 @@ class Connection:
         :param url: A `bytes` representation of the URL.
         :param method: A `bytes` representation of the method.
         """
-        self.last_task_time = time()
-        # self.current_task = Task(self.send_response(), loop=self.loop)
+        self.last_task_time = self.server.now
+        self._touch(self)
+        self.stream.set_length(headers.content_length)
+        self.keep_alive = self.parser.should_keep_alive()
+        # self.current_task = self._create_task(self.send_response())
 
     def on_body(self, body: bytes):
         """ (PFC) Reads the body of the request.
 
-        This method pauses the reading of the socket while the response
-        is being processed, helping prevent DoS, until the user explicitly
-        consumes the stream.
+        Once more than `PAUSE_WATERMARK` bytes of the body are waiting to be
+        consumed, this method pauses the reading of the socket, helping
+        prevent DoS, until the user consumes the stream. Bodies that fit
+        under the watermark never pause the transport. Reading resumes only
+        once the consumer has emptied the stream, and is never paused while
+        the whole body is being read at once, so the transport is not
+        toggled for every chunk.
 
         :param body: A `bytes` representation of the request body.
         """
-        self.stream._put(body)
-        self.pause_reading()
+        self._stream_put(body)
+        stream = self.stream
+        if self.readable and not stream.draining and stream.size >= PAUSE_WATERMARK:
+            self._transport_pause_reading()
+            self.readable = False
 
     def on_message_complete(self):
         """ (PFC) Closes the stream and sets up the process for monitoring. """
@@ -129,12 +241,15 @@ class Connection:
 
     def after_response(self):
         """ Handles after-response network flow. """
-        self.status: int = STATUS_PENDING
+        if self.status != STATUS_CLOSED:
+            self.status = STATUS_PENDING
+            self.last_task_time = self.server.now
+            self._touch(self)
 
         if not self.keep_alive:
             self.close()
         elif self._stopped:
-            self.loop.create_task(self.scheduled_close(timeout=30))
+            self._create_task(self.scheduled_close(timeout=30))
         else:
             self.resume_reading()
 
@@ -144,19 +259,41 @@ class Connection:
             self.timeout_task.cancel()
             self.timeout_task = None
 
-    async def write(self, data: bytes):
+    def write(self, data: Union[bytes, list, tuple]) -> Optional[Awaitable]:
         """ Writes data to the client.
 
-        :param data: A `bytes` representation of data to return.
+        A `list` or `tuple` of chunks, such as a status line, headers and
+        body, is handed to the transport in one call so it can be sent
+        with a single gathered write.
+
+        This method is not a coroutine, so the common case of a writable
+        transport costs no coroutine at all. Only when the transport has
+        asked for writing to pause is an awaitable returned, which the
+        caller should await before writing more::
+
+            waiter = connection.write(data)
+            if waiter is not None:
+                await waiter
+
+        :param data: A `bytes` representation of data to return, or a
+                     sequence of `bytes` chunks.
+
+        :return: `None`, or an awaitable that resolves once writing resumes.
         """
-        self.transport.write(data)
+        if isinstance(data, (list, tuple)):
+            self._transport_writelines(data)
+        else:
+            self._transport_write(data)
 
         if not self.writable:
-            await self.write_permission.wait()
+            return self._write_permission_wait()
+
+        return None
 
     def pause_writing(self):
         """ (NFC) Pauses the transport writing to the client. """
         self.writable = False
+        self.write_permission.clear()
 
     def resume_writing(self):
         """ (NFC) Resumes the transport writing to the client. """
@@ -175,10 +312,12 @@ class Connection:
 
     def close(self):
         """ (NFC) Closes the transport connection. """
-        if not self.closed:
-            self.transport.close()
-            self.server.connections.discard(self)
-            self.closed = True
+        if self.status == STATUS_CLOSED:
+            return
+
+        self.status = STATUS_CLOSED
+        self.transport.close()
+        self.server.connections.discard(self)
 
     async def scheduled_close(self, timeout: int = 30):
         """ (NFC) Closes the connection after a scheduled timeout. """
@@ -193,3 +332,83 @@ class Connection:
         self._stopped = True
         if self.status == STATUS_PENDING:
             self.close()
+
+
+class ConnectionList:
+    """ Implements the `ConnectionList` class.
+
+    This class is an intrusive doubly-linked list of `Connection` objects.
+    Each connection carries its own `_prev` and `_next` links, so adding
+    and removing a connection never hashes it and the list never has to
+    resize. The list itself serves as the sentinel node.
+
+    Connections are moved to the end of the list whenever they are active,
+    so the list stays ordered from the longest idle to the most recent,
+    and an idle sweep can stop at the first connection that is still fresh.
+
+    The connection currently yielded by iteration may be removed from
+    the list without breaking the iteration.
+    """
+
+    __slots__ = ("_prev", "_next", "_size")
+
+    def __init__(self):
+        self._prev = self
+        self._next = self
+        self._size: int = 0
+
+    def __iter__(self):
+        node = self._next
+        while node is not self:
+            following = node._next
+            yield node
+            node = following
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, connection: Connection):
+        """ Links a connection onto the end of the list.
+
+        :param connection: The `Connection` to add.
+        """
+        if connection._next is not None:
+            return
+
+        last = self._prev
+        connection._prev = last
+        connection._next = self
+        last._next = connection
+        self._prev = connection
+        self._size += 1
+
+    def touch(self, connection: Connection):
+        """ Moves a connection in the list to the end of the list.
+
+        :param connection: The `Connection` to move.
+        """
+        if connection._next is None or connection._next is self:
+            return
+
+        connection._prev._next = connection._next
+        connection._next._prev = connection._prev
+
+        last = self._prev
+        connection._prev = last
+        connection._next = self
+        last._next = connection
+        self._prev = connection
+
+    def discard(self, connection: Connection):
+        """ Unlinks a connection from the list if it is present.
+
+        :param connection: The `Connection` to remove.
+        """
+        if connection._next is None:
+            return
+
+        connection._prev._next = connection._next
+        connection._next._prev = connection._prev
+        connection._prev = None
+        connection._next = None
+        self._size -= 1
@@ -4,76 +4,156 @@ apodo.net.headers
 
 This module contains the `Headers` class.
 """
+from typing import Union
 
 
-class Headers(dict):
-    """ Implements the `Headers` class, a subclass of `dict`.
+def _normalize(key: Union[str, bytes]) -> bytes:
+    """ Normalizes a header name to the lowercase `bytes` used as its key.
 
-    :param raw: A raw `list` of headers to parse. These headers should serverear
-                in `list` pairs, with index 0 being the name of the header,
-                and index 1 being the value of the header.
+    :param key: A `str` or `bytes` header name.
+
+    :return: The lowercased `bytes` header name.
     """
+    if isinstance(key, str):
+        return key.lower().encode("utf-8")
+
+    return key.lower()
+
+
+class Headers:
+    """ Implements the `Headers` class.
+
+    Header names and values are kept as `bytes` in two parallel lists,
+    alongside an index from each lowercased name to its position. The
+    table is filled once, as the parser produces the headers, and values
+    are only decoded when they are read. When a name is repeated, the first
+    value received is kept and later ones are dropped.
+
+    The headers the server itself relies on are picked out during that
+    same pass and kept as attributes, so reading them costs no lookup:
+    `content_type` and `cookie` as raw `bytes`, and `content_length` as
+    an `int`. Each is `None` when the header is absent.
+
+    :param raw: (optional) A raw `list` of headers to load. These headers
+                should appear in pairs, with index 0 being the name of the
+                header, and index 1 being the value of the header.
+    """
+
+    __slots__ = (
+        "_names",
+        "_values",
+        "_index",
+        "content_type",
+        "content_length",
+        "cookie",
+    )
+
+    def __init__(self, raw: list = None):
+        self._names: list = []
+        self._values: list = []
+        self._index: dict = {}
+
+        self.content_type: bytes = None
+        self.content_length: int = None
+        self.cookie: bytes = None
 
-    def __init__(self, raw=None):
-        super().__init__(raw or [])
+        for name, value in raw or ():
+            self.add(name, value)
 
-        self.raw = raw
+    def __getitem__(self, item: Union[str, bytes]) -> str:
+        return self._values[self._index[_normalize(item)]].decode("utf-8")
 
-    def __getitem__(self, item: str):
-        if not self.evaluated:
-            self.eval()
+    def __setitem__(self, key: Union[str, bytes], value: Union[str, bytes]):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
 
-        return self.values[item.lower()]
+        name = _normalize(key)
+        position = self._index.get(name)
+        if position is None:
+            self.add(name, value)
+        else:
+            self._values[position] = value
+            self._probe(name, value)
 
-    def __setitem__(self, key: str, value: str):
-        if not self.evaluated:
-            self.eval()
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        return _normalize(item) in self._index
 
-        self.values[key.lower()] = value
+    def __len__(self) -> int:
+        return len(self._index)
 
     def __repr__(self):
         return f"<Headers {self.dump()}>"
 
-    def get(self, key, default=None):
-        """ Gets a given header value by `key`.
+    def add(self, name: bytes, value: bytes):
+        """ Adds a raw header to the table, unless its name is already present.
 
-        :param key: A `str` key name to search for.
-        :param default: (optional) A replaceable default return value.
-        :return: The found header value.
+        :param name: A `bytes` header name, in any case.
+        :param value: A `bytes` header value.
         """
-        if not self.evaluated:
-            self.eval()
+        name = name.lower()
+        if name in self._index:
+            return
+
+        self._index[name] = len(self._values)
+        self._names.append(name)
+        self._values.append(value)
+        self._probe(name, value)
 
-        return self.values.get(key.lower()) or default
+    def _probe(self, name: bytes, value: bytes):
+        """ Keeps the directly accessible header attributes up to date.
+
+        :param name: A lowercased `bytes` header name.
+        :param value: A `bytes` header value.
+        """
+        if name == b"content-type":
+            self.content_type = value
+        elif name == b"content-length":
+            self.content_length = int(value)
+        elif name == b"cookie":
+            self.cookie = value
+
+    def get(self, key: Union[str, bytes], default=None):
+        """ Gets a given header value by `key`.
 
-    def eval(self):
-        """ Evaluates and stores raw header values. """
-        self.values = {}
-        while self.raw:
-            header = self.raw.pop()
-            self.values[header[0].decode("utf-8").lower()] = header[1].decode("utf-8")
+        :param key: A `str` or `bytes` key name to search for.
+        :param default: (optional) A replaceable default return value.
+        :return: The found header value, or `default` if it is absent or empty.
+        """
+        position = self._index.get(_normalize(key))
+        if position is None:
+            return default
 
-        self.evaluated = True
+        value = self._values[position]
+        if not value:
+            return default
 
-    def dump(self):
-        """ Gets all headers, evaluating them if not yet done. """
-        if not self.evaluated:
-            self.eval()
+        return value.decode("utf-8")
 
-        return self.values
+    def dump(self) -> dict:
+        """ Gets all headers as a `dict` of decoded names and values. """
+        return {
+            name.decode("utf-8"): value.decode("utf-8")
+            for name, value in zip(self._names, self._values)
+        }
 
-    def parse_cookies(self):
+    def parse_cookies(self) -> dict:
         """ Parses any cookies in the headers.
 
+        The header is split on `;` and each piece on its first `=`, so
+        parsing takes linear time whatever the header holds. Names and
+        values are stripped of surrounding whitespace. Pieces without an
+        `=` or with an empty name are skipped.
+
         :return cookies: a `dict` of key, value cookie pairs.
         """
-        header = self.get("cookie")
+        if self.cookie is None:
+            return {}
+
         cookies = {}
-        if header:
-            for cookie in header.split(";"):
-                first = cookie.find("=")
-                name = cookie[:first].strip()
-                value = cookie[first + 1 :]
-                cookies[name] = value
+        for piece in self.cookie.split(b";"):
+            name, separator, value = piece.partition(b"=")
+            name = name.strip()
+            if separator and name:
+                cookies[name.decode("utf-8")] = value.strip().decode("utf-8")
 
         return cookies
@@ -4,12 +4,16 @@ apodo.server
 
 This module contains the core `Apodo` class.
 """
+from asyncio import sleep
 from email.utils import formatdate
 from functools import partial
-from multiprocessing import cpu_count
+from time import time
 
 from .net.connection import Connection
+from .net.connection import ConnectionList
+from .net.connection import RECEIVE_BUFFER_SIZE
 from .util.utils import bind
+from .util.utils import default_workers
 from .util.utils import pause
 from .util.workers.handler import Handler
 from .util.workers.necromancer import Necromancer
@@ -22,7 +26,21 @@ class Server:
     and contains other attribute/instance data.
     """
 
-    current_time: str = formatdate(timeval=None, localtime=False, usegmt=True)
+    __slots__ = (
+        "initialized",
+        "handler",
+        "connections",
+        "workers",
+        "loop",
+        "reaper",
+        "necromancer",
+        "ticker",
+        "recv_buffer",
+        "recv_view",
+        "now",
+        "current_time",
+        "running",
+    )
 
     def __init__(self):
         super().__init__()
@@ -30,10 +48,17 @@ class Server:
 
         self.handler = Connection
 
-        self.connections = set()
+        self.connections = ConnectionList()
         self.workers = []
 
         self.loop = None
+        self.reaper = None
+        self.necromancer = None
+        self.ticker = None
+        self.recv_buffer: bytearray = bytearray(RECEIVE_BUFFER_SIZE)
+        self.recv_view: memoryview = memoryview(self.recv_buffer)
+        self.now: float = 0.0
+        self.current_time: bytes = formatdate(usegmt=True).encode("utf-8")
 
         self.initialized = False
         self.running = False
@@ -44,14 +69,16 @@ class Server:
         port: int = 5000,
         workers: int = None,
         block: bool = True,
+        pin_workers: bool = False,
     ):
-        spawner = partial(Handler, self, host, port)
-        for _ in range(0, (workers or cpu_count())):
-            worker = spawner()
+        spawner = partial(Handler, self, host, port, pin_cpu=pin_workers)
+        for index in range(0, (workers or default_workers())):
+            worker = spawner(worker_index=index)
             worker.start()
-            self.workers.serverend(worker)
+            self.workers.append(worker)
 
-        Necromancer(self.workers, spawner=spawner).start()
+        self.necromancer = Necromancer(self, spawner=spawner)
+        self.necromancer.start()
 
         bind(host, port)
         print("Apodo - Running on http://" + str(host) + ":" + str(port))
@@ -60,12 +87,42 @@ class Server:
         if block:
             try:
                 pause()
-                self.running = False
             except KeyboardInterrupt:
-                self.stop()
+                pass
+
+            self.stop()
+
+    async def tick(self, interval: float = 0.1):
+        """ Keeps `now` in step with the event loop's monotonic clock.
+
+        Connections stamp their activity with `now` rather than asking the
+        clock themselves, so reading the time costs an attribute load
+        instead of a clock call per request.
+
+        The encoded `Date` header value in `current_time` is refreshed here
+        too, whenever the wall-clock second changes, which is all the
+        resolution HTTP dates have. It never lags by more than `interval`.
+
+        This runs until it is cancelled. Workers keep its task in `ticker`
+        and cancel it when they stop.
+
+        :param interval: (optional) A `float` count of seconds between updates.
+        """
+        last_second = 0
+        while True:
+            self.now = self.loop.time()
+            second = int(time())
+            if second != last_second:
+                self.current_time = formatdate(second, usegmt=True).encode("utf-8")
+                last_second = second
+
+            await sleep(interval)
 
     def stop(self):
         """ Kills all active worker processes. """
+        if self.necromancer:
+            self.necromancer.must_work = False
+
         for process in self.workers:
             process.terminate()
 
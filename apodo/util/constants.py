@@ -1,3 +1,15 @@
+GET: bytes = b"GET"
+POST: bytes = b"POST"
+PUT: bytes = b"PUT"
+PATCH: bytes = b"PATCH"
+DELETE: bytes = b"DELETE"
+HEAD: bytes = b"HEAD"
+OPTIONS: bytes = b"OPTIONS"
+
+# Maps each standard method to a single shared object, so parsed methods can
+# be swapped for it and compared by identity.
+METHODS = {method: method for method in (GET, POST, PUT, PATCH, DELETE, HEAD, OPTIONS)}
+
 ALL_STATUS_CODES = {
     100: "Continue",
     101: "Switching Protocols",
@@ -4,32 +4,129 @@ apodo.util.parser
 
 This module contains the `Parser` class.
 """
-from apodo.net.connection import Connection
+from typing import Callable
+from typing import TYPE_CHECKING
+
+from httptools import HttpParserError
+from httptools import HttpParserUpgrade
+from httptools import HttpRequestParser
+
+from apodo.net.headers import Headers
+from apodo.util.constants import METHODS
+
+if TYPE_CHECKING:
+    from apodo.net.connection import Connection
+
+PARSE_OK: int = 0
+PARSE_ERROR: int = 1
 
 
 class Parser:
     """ Implements the `Parser` class.
 
-    This class serves as a functional default HTTP parser for the `Connection`
-    object, but is not optimised or C-powered. The intention is that other parsers,
-    namely Kolla, will be used in its place when completed.
+    This class adapts the C-powered `httptools` request parser to the
+    `Connection` object. It serves as the parser's callback protocol,
+    collecting the URL and headers of each request as they arrive and
+    passing the completed request, its body and its end on to the
+    connection's (PFC) callbacks.
+
+    The parser is incremental, so a request may be fed to it in any
+    number of pieces.
 
     :param connection: A `Connection` instance.
     """
 
-    def __init__(self, connection: Connection):
-        self.connection: Connection = connection
-
-    def parse(self, data):
-        """ Parses request data. """
-        self.request, *headers, _, self.body = data.split("\r\n")
-        self.method, self.path, self.protocol = self.request.split(" ")
-        self.headers = dict(line.split(":", maxsplit=1) for line in headers)
-
-        return {
-            "method": self.method,
-            "path": self.path,
-            "protocol": self.protocol,
-            "headers": self.headers,
-            "body": self.body,
-        }
+    __slots__ = ("connection", "url", "headers", "_parser", "_feed", "_on_body")
+
+    def __init__(self, connection: "Connection"):
+        self.connection: "Connection" = connection
+        self.url: bytes = b""
+        self.headers: Headers = None
+        self._parser: HttpRequestParser = HttpRequestParser(self)
+        self._feed: Callable = self._parser.feed_data
+        self._on_body: Callable = connection.on_body
+
+    def feed_data(self, data: memoryview) -> int:
+        """ Feeds request data to the parser.
+
+        Malformed data is reported through the return value instead of an
+        exception, so the connection's receive callback can branch on the
+        result without setting up an exception handler per call.
+
+        Protocol upgrades (e.g. WebSocket or h2c) are not supported, so the
+        `Upgrade` header is ignored and the request is served as a plain
+        HTTP/1.1 request, as RFC 7230 allows. The parser stops right after
+        such a request's headers, so feeding resumes from there. An upgrade
+        request with a body is reported as malformed, since the parser has
+        already ended the request without it.
+
+        The data may be a view over a buffer that is reused for the next
+        read; the parser copies out whatever it hands to the callbacks.
+
+        :param data: A bytes-like object of the incoming data.
+
+        :return: `PARSE_OK` on success, or `PARSE_ERROR` for malformed data.
+        """
+        while True:
+            try:
+                self._feed(data)
+            except HttpParserUpgrade as exc:
+                headers = self.headers
+                if headers.content_length or "transfer-encoding" in headers:
+                    return PARSE_ERROR
+
+                data = data[exc.args[0] :]
+                if data:
+                    continue
+            except HttpParserError:
+                return PARSE_ERROR
+
+            return PARSE_OK
+
+    def should_keep_alive(self) -> bool:
+        """ Checks whether the connection may be reused after this request.
+
+        This follows the request's HTTP version and every token of its
+        `Connection` header, so HTTP/1.0 requests close by default.
+
+        :return: A `bool` indicating whether to keep the connection alive.
+        """
+        return self._parser.should_keep_alive()
+
+    def on_message_begin(self):
+        """ Resets the collected URL and headers for a new request. """
+        self.url = b""
+        self.headers = Headers()
+
+    def on_url(self, url: bytes):
+        """ Collects a piece of the request URL.
+
+        :param url: A `bytes` piece of the URL.
+        """
+        self.url += url
+
+    def on_header(self, name: bytes, value: bytes):
+        """ Adds a received header to the table.
+
+        :param name: A `bytes` header name.
+        :param value: A `bytes` header value.
+        """
+        self.headers.add(name, value)
+
+    def on_headers_complete(self):
+        """ Passes the request line and headers on to the connection. """
+        method = self._parser.get_method()
+        self.connection.on_headers_complete(
+            self.headers, self.url, METHODS.get(method, method)
+        )
+
+    def on_body(self, body: bytes):
+        """ Passes a received chunk of the body on to the connection.
+
+        :param body: A `bytes` chunk of the body.
+        """
+        self._on_body(body)
+
+    def on_message_complete(self):
+        """ Tells the connection the request has been fully received. """
+        self.connection.on_message_complete()
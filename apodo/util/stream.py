@@ -4,82 +4,148 @@ apodo.util.stream
 
 This module contains the `Stream` class.
 """
-from asyncio import Event
-from collections import deque
+from asyncio import Future
+from typing import TYPE_CHECKING
 
-from apodo.net.connection import Connection
 from apodo.util.exceptions import StreamAlreadyConsumed
 
+if TYPE_CHECKING:
+    from apodo.net.connection import Connection
 
-class Stream(deque):
+PREALLOCATION_LIMIT: int = 65536
+
+
+class Stream:
     """ Implements the `Stream` class.
 
-    This class, previously separated into `StreamQueue` and `Stream`,
-    `StreamQueue` having an `items` property that was a `deque` object,
-    is now a modified subclass of `deque`.
+    This class collects a request body into a single growable `bytearray`
+    as the parser delivers it, rather than keeping a separate `bytes`
+    object per chunk. The body can either be read whole with `read`, or
+    iterated over to receive whatever has arrived since the last step.
+
+    When the body length is known up front, the buffer is allocated at
+    that size once the first chunk arrives and chunks are copied into
+    place, so collecting a small body never reallocates it. Preallocation
+    is capped at `PREALLOCATION_LIMIT` and deferred until data is actually
+    received, so that a declared length alone cannot reserve memory;
+    larger bodies grow the buffer from there.
+
+    :param connection: The `Connection` the body is received on.
     """
 
+    __slots__ = (
+        "connection",
+        "buffer",
+        "size",
+        "length",
+        "_waiter",
+        "finished",
+        "consumed",
+        "draining",
+    )
+
     def __init__(self, connection):
-        self.connection: Connection = connection
-        self.event: Event = Event()
-        self.waiting: bool = False
-        self.dirty: bool = False
+        self.connection: "Connection" = connection
+        self.buffer: bytearray = bytearray()
+        self.size: int = 0
+        self.length: int = None
+        self._waiter: Future = None
         self.finished: bool = False
+        self.consumed: bool = False
+        self.draining: bool = False
+
+    def set_length(self, length: int):
+        """ Records the length of the body, so the buffer can be sized for it.
+
+        :param length: The `int` length of the body, or `None` if unknown.
+        """
+        self.length = length
 
     async def read(self) -> bytearray:
-        data = bytearray()
-        async for chunk in self:
-            data.extend(chunk)
+        """ Reads the whole body once it has been received.
+
+        The collected buffer is handed over as-is rather than copied. Since
+        the whole body is wanted anyway, the stream is marked as draining so
+        the connection keeps reading instead of pausing at its watermark.
+
+        :return: A `bytearray` of the body.
+        """
+        if self.consumed:
+            raise StreamAlreadyConsumed()
+
+        self.draining = True
+        while not self.finished:
+            await self._wait()
+
+        data = self.buffer
+        if len(data) != self.size:
+            del data[self.size :]
+
+        self.buffer = bytearray()
+        self.size = 0
+        self.consumed = True
         return data
 
     def end(self):
-        if self.waiting:
-            self._put(b"")
+        """ Marks the body as completely received. """
         self.finished = True
+        self._wake()
 
     def clear(self):
-        if self.dirty:
-            super().clear()
-            self.event.clear()
-            self.dirty = False
+        """ Resets the stream for the next request on the connection. """
+        self.buffer = bytearray()
+        self.size = 0
+        self.length = None
+        self._waiter = None
         self.finished = False
+        self.consumed = False
+        self.draining = False
 
     async def __aiter__(self) -> bytes:
+        if self.consumed:
+            raise StreamAlreadyConsumed()
+
         while True:
-            self.connection.resume_reading()
-            data = await self._get()
-            if not data:
-                self.consumed = True
-                break
-            self.connection.pause_reading()
+            if not self.size:
+                if self.finished:
+                    self.consumed = True
+                    break
+
+                await self._wait()
+                continue
+
+            with memoryview(self.buffer) as view:
+                data = bytes(view[: self.size])
+            self.size = 0
             yield data
 
-    async def _get(self) -> bytes:
-        """
-        It should eventually be determined whether this method (`get`, in the original)
-        is used outside of the `__aiter__` method in this class.
-        If not, it should be integrated into the `__aiter__` method.
+    async def _wait(self):
+        """ Resumes reading and waits for more of the body to arrive.
+
+        There is only ever one consumer, so a single future stands in for
+        an `Event` and its list of waiters.
         """
-        try:
-            return self.popleft()
-        except IndexError:
-            if self.finished is True:
-                raise StreamAlreadyConsumed()
-            else:
-                self.event.clear()
-                self.waiting = True
-                await self.event.wait()
-                self.event.clear()
-                self.waiting = False
-                return self.popleft()
+        self.connection.resume_reading()
+        self._waiter = self.connection.loop.create_future()
+        await self._waiter
+
+    def _wake(self):
+        """ Wakes the consumer if it is waiting for more of the body. """
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
 
     def _put(self, item: bytes):
+        """ Copies a received chunk of the body into the buffer.
+
+        :param item: A `bytes` chunk of the body.
         """
-        It should eventually be determined whether this method (`put`, in the original)
-        is used outside of the `end` method in this class.
-        If not, it should be integrated into the `end` method.
-        """
-        self.dirty = True
-        self.serverend(item)
-        if self.waiting is True:
-            self.event.set()
+        if self.length and not self.buffer:
+            self.buffer = bytearray(min(self.length, PREALLOCATION_LIMIT))
+
+        end = self.size + len(item)
+        self.buffer[self.size : end] = item
+        self.size = end
+        self._wake()
@@ -8,14 +8,33 @@ import os
 import signal
 import socket
 import time
+from multiprocessing import cpu_count
 from typing import Iterable
 from typing import Tuple
 from typing import Union
 
+from apodo.util.constants import GET
+from apodo.util.constants import METHODS
+
+STOP_SIGNALS = {signal.SIGINT, signal.SIGTERM}
+
 
 class RequestParams:
+    """ Implements the `RequestParams` class.
+
+    This class wraps a `dict` of parameter names to lists of values. The
+    first value of each parameter is picked out once, up front, so `get`
+    costs a single lookup. The wrapped values should not be changed
+    afterwards.
+
+    :param values: A `dict` of parameter names to `list`s of values.
+    """
+
+    __slots__ = ("values", "_first")
+
     def __init__(self, values: dict):
         self.values = values
+        self._first = {key: value[0] for key, value in values.items() if value}
 
     def __getattr__(self, item):
         return getattr(self.values, item)
@@ -24,50 +43,87 @@ class RequestParams:
         return self.values[item]
 
     def get(self, item):
-        v = self.values.get(item)
-        return v[0] if v else None
+        return self._first.get(item)
 
     def get_list(self, item, default=None):
         return self.values.get(item, default or [])
 
 
+def default_workers() -> int:
+    """ Gets the default count of worker processes.
+
+    The count is read from the `APODO_WORKERS` environment variable when it
+    is set, and falls back to the CPU count otherwise. It is read when the
+    server starts rather than at import, so a bad value cannot break
+    importing the package.
+
+    :return: An `int` count of workers.
+    """
+    value = os.environ.get("APODO_WORKERS", "").strip()
+    if not value:
+        return cpu_count()
+
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+
+    if workers < 1:
+        raise ValueError(
+            f"APODO_WORKERS must be a positive integer, got {value!r} instead."
+        )
+
+    return workers
+
+
 def bind(host: str, port: int, timeout: int = 10):
     """ Binds to socket when available.
 
+    Connection attempts back off exponentially, from 1ms up to 100ms apart,
+    so waiting on slow workers doesn't keep the parent process busy.
+
     :param host: A `str` host to connect to.
     :param port: An `int` TCP port to connect to.
     :param timeout: An `int` count of seconds to wait before timing out.
     """
-    sock = socket.socket()
-    sock.settimeout(timeout)
-
-    while timeout > 0:
-        start = time.time()
+    deadline = time.monotonic() + timeout
+    delay = 0.001
 
+    while time.monotonic() < deadline:
         try:
-            sock.connect((host, port))
-            sock.close()
-            break
+            with socket.create_connection((host, port), timeout=0.2):
+                return
         except OSError:
-            time.sleep(0.001)
-            timeout -= time.time() - start
-    else:
-        sock.close()
-        raise TimeoutError("Server is taking too long to get online.")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    raise TimeoutError("Server is taking too long to get online.")
 
 
 def pause():
-    """ Pauses the process until a signal is received. """
+    """ Pauses the process until it is asked to stop.
+
+    On POSIX systems the stop signals are blocked and waited for directly,
+    so only `SIGINT` or `SIGTERM` wake the process, and it returns normally
+    instead of being killed by the default `SIGTERM` action.
+    """
     if os.name == "nt":
         while True:
             time.sleep(60)
-    else:
-        signal.pause()
+
+    previous = signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+    try:
+        signal.sigwait(STOP_SIGNALS)
+    finally:
+        signal.pthread_sigmask(signal.SIG_SETMASK, previous)
 
 
 def clean_methods(methods: Iterable[Union[str, bytes]]) -> Tuple[bytes]:
     """ Cleans HTTP method values.
 
+    Standard methods are returned as the interned objects from `METHODS`,
+    the same ones the parser hands over, so they compare by identity.
+
     :param methods: An iterable of method `str`s.
 
     :return: A `tuple` of `bytes` with each HTTP method.
@@ -77,30 +133,14 @@ def clean_methods(methods: Iterable[Union[str, bytes]]) -> Tuple[bytes]:
 
         for method in methods:
             if isinstance(method, str):
-                parsed_methods.add(method.upper().encode())
+                method = method.upper().encode()
             elif isinstance(method, bytes):
-                parsed_methods.add(method.upper())
+                method = method.upper()
             else:
                 raise Exception("Methods should be str or bytes.")
 
+            parsed_methods.add(METHODS.get(method, method))
+
         return tuple(parsed_methods)
     else:
-        return (b"GET",)
-
-
-def parse_http(http: str):
-    """ Parses an HTTP string and returns a `dict` of the event.
-
-    :param http: A decoded `str` HTTP request.
-    """
-    request, *headers, _, body = http.split("\r\n")
-    method, path, protocol = request.split(" ")
-    headers = dict(line.split(":", maxsplit=1) for line in headers)
-
-    return {
-        "method": method,
-        "path": path,
-        "protocol": protocol,
-        "headers": headers,
-        "body": body,
-    }
+        return (GET,)
@@ -5,6 +5,7 @@ apodo.util.workers.handler
 This module contains the `Handler` class.
 """
 import asyncio
+import os
 import signal
 from functools import partial
 from multiprocessing import Process
@@ -15,7 +16,14 @@ from socket import socket
 from socket import SOL_SOCKET
 from socket import TCP_NODELAY
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from apodo.net.connection import STATUS_CLOSED
 from apodo.server import Server
+from apodo.util.utils import STOP_SIGNALS
 from apodo.util.workers.reaper import Reaper
 
 
@@ -28,9 +36,21 @@ class Handler(Process):
     :param host: A `str` host to bind to.
     :param port: A `int` port to bind to.
     :param sock: (optional) An existing `socket` to use.
+    :param worker_index: (optional) The `int` position of this worker among
+                         the server's workers.
+    :param pin_cpu: (optional) A `bool` indicating whether the worker should
+                    be pinned to a single CPU, chosen by `worker_index`.
     """
 
-    def __init__(self, server: Server, host: str, port: int, sock=None):
+    def __init__(
+        self,
+        server: Server,
+        host: str,
+        port: int,
+        sock=None,
+        worker_index: int = 0,
+        pin_cpu: bool = False,
+    ):
         super().__init__()
 
         self.server = server
@@ -38,8 +58,18 @@ class Handler(Process):
         self.port = port
         self.daemon = True
         self.socket = sock
+        self.worker_index = worker_index
+        self.pin_cpu = pin_cpu
 
     def run(self):
+        if hasattr(signal, "pthread_sigmask"):
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+
+        self.server.__init__()
+
+        if self.pin_cpu:
+            self._pin_cpu()
+
         if not self.socket:
             self._bind_socket()
 
@@ -52,6 +82,19 @@ class Handler(Process):
         except (SystemExit, KeyboardInterrupt):
             self.server.loop.stop()
 
+    def _pin_cpu(self):
+        """ Pins the worker to one of the CPUs it is allowed to run on.
+
+        Workers are spread round-robin over the allowed CPUs by their index,
+        so each event loop keeps its own core and caches. Platforms without
+        CPU affinity support are left untouched.
+        """
+        if not hasattr(os, "sched_setaffinity"):
+            return
+
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[self.worker_index % len(cpus)]})
+
     def _bind_socket(self):
         self.socket = socket()
 
@@ -62,7 +105,10 @@ class Handler(Process):
         self.socket.bind((self.host, self.port))
 
     def _create_loop(self):
-        loop = asyncio.new_event_loop()
+        if uvloop:
+            loop = uvloop.new_event_loop()
+        else:
+            loop = asyncio.new_event_loop()
 
         loop.server = self.server
         self.server.loop = loop
@@ -70,11 +116,12 @@ class Handler(Process):
         asyncio.set_event_loop(loop)
 
     def _start_server(self):
+        self.server.now = self.server.loop.time()
+        self.server.ticker = self.server.loop.create_task(self.server.tick())
+
         self.server.reaper = Reaper(server=self.server)
         self.server.reaper.start()
 
-        self.server.__init__()
-
         handler = partial(
             self.server.handler, server=self.server, loop=self.server.loop, worker=self
         )
@@ -86,16 +133,16 @@ class Handler(Process):
 
     async def _stop_server(self, timeout=30):
         """ Runs a soft-to-hard stop on active connections. """
-        self.server.reaper.has_to_work = False
+        self.server.reaper.stop()
 
-        for connection in self.server.connections.copy():
+        for connection in self.server.connections:
             connection.stop()
 
         while timeout:
             all_closed = True
 
             for connection in self.server.connections:
-                if not connection.is_closed():
+                if connection.status != STATUS_CLOSED:
                     all_closed = False
                     break
 
@@ -105,6 +152,12 @@ class Handler(Process):
             timeout -= 1
             await asyncio.sleep(1)
 
+        ticker = self.server.ticker
+        if ticker is not None:
+            ticker.cancel()
+            await asyncio.wait([ticker])
+            self.server.ticker = None
+
         self.server.loop.stop()
 
     def _handle_kill(self):
@@ -4,11 +4,14 @@ apodo.util.workers.necromancer
 
 This module contains the `Necromancer` class.
 """
+import signal
 import time
+from multiprocessing.connection import wait
 from threading import Thread
 from typing import Callable
 
 from apodo.server import Server
+from apodo.util.utils import STOP_SIGNALS
 
 
 class Necromancer(Thread):
@@ -16,31 +19,85 @@ class Necromancer(Thread):
 
     :param server: The current `Server` object.
     :param spawner: A function to call to spawn workers.
-    :param interval: An `int` indicating the interval at which workers should be
-                       spawned/resurrected.
+    :param interval: An `int` count of seconds between checks for whether
+                     the `Necromancer` should stop.
+    :param min_uptime: (optional) A `float` count of seconds a worker must
+                       stay up for its next respawn to be immediate.
+    :param max_delay: (optional) A `float` cap, in seconds, on how long a
+                      respawn is held back.
     """
 
-    def __init__(self, server, spawner: Callable, interval: int = 5):
+    def __init__(
+        self,
+        server,
+        spawner: Callable,
+        interval: int = 5,
+        min_uptime: float = 10.0,
+        max_delay: float = 30.0,
+    ):
         super().__init__()
 
         self.server: Server = server
         self.spawner: Callable = spawner
         self.interval: int = interval
+        self.min_uptime: float = min_uptime
+        self.max_delay: float = max_delay
 
         self.must_work: bool = True
 
     def run(self):
-        while self.must_work:
-            time.sleep(self.interval)
+        """ Respawns workers as soon as they die.
+
+        All worker sentinels are waited on at once, so a dead worker is
+        noticed immediately rather than on the next poll. The wait wakes at
+        least every `interval` seconds to check whether it should stop.
+
+        A worker that dies within `min_uptime` of being spawned is respawned
+        after a delay that doubles with each such death, up to `max_delay`,
+        so a worker that cannot start (e.g. failing to bind) is not forked
+        in a tight loop. The delay resets once a worker stays up.
+
+        The stop signals are blocked in this thread, so they are always left
+        for the main thread waiting in `pause`.
+        """
+        if hasattr(signal, "pthread_sigmask"):
+            signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+
+        workers = self.server.workers
+        started = [time.monotonic()] * len(workers)
+        delays = [0.0] * len(workers)
+        pending = {}
 
-            living_workers = []
-            for worker in self.server.workers:
-                if not worker.is_alive():
-                    worker = self.spawner()
+        while self.must_work:
+            now = time.monotonic()
+            for index, due in list(pending.items()):
+                if due <= now:
+                    del pending[index]
+                    workers[index].close()
+                    worker = self.spawner(worker_index=workers[index].worker_index)
                     worker.start()
+                    workers[index] = worker
+                    started[index] = now
 
-                    living_workers.serverend(worker)
-                else:
-                    living_workers.serverend(worker)
+            sentinels = {
+                worker.sentinel: index
+                for index, worker in enumerate(workers)
+                if index not in pending
+            }
+            timeout = self.interval
+            if pending:
+                timeout = min(timeout, max(min(pending.values()) - now, 0.0))
+
+            for sentinel in wait(list(sentinels), timeout=timeout):
+                if not self.must_work:
+                    break
 
-            self.server.workers = living_workers
+                index = sentinels[sentinel]
+                workers[index].join()
+
+                now = time.monotonic()
+                if now - started[index] >= self.min_uptime:
+                    delays[index] = 0.0
+                else:
+                    delays[index] = min(max(delays[index] * 2, 0.1), self.max_delay)
+                pending[index] = now + delays[index]
@@ -7,13 +7,12 @@ This module contains the `Reaper` class.
 import os
 import signal
 import time
-from datetime import datetime
-from datetime import timezone
-from email.utils import formatdate
+from asyncio import TimerHandle
+from threading import Event
 from threading import Thread
 
+from apodo.net.connection import ConnectionList
 from apodo.net.connection import STATUS_PENDING
-from apodo.net.connection import STATUS_PROCESSING
 from apodo.server import Server
 
 
@@ -22,55 +21,114 @@ class Reaper(Thread):
 
     This class automatically kills/cleans idle/dead connections.
 
+    Idle connections are swept on the event loop that owns them, scheduled
+    with `call_later`, so their transports are never touched from another
+    thread. Only the stuck-worker check runs on the `Reaper` thread itself,
+    since a blocked loop cannot check itself. It watches the loop's
+    heartbeat, `server.now`, which stops advancing while the loop is
+    blocked, and sleeps until the heartbeat could next go stale.
+
     :param server: The current `Server` instance.
+    :param keep_alive_timeout: (optional) An `int` count of seconds an idle
+                               connection is kept open, or 0 to keep idle
+                               connections open indefinitely.
+    :param worker_timeout: (optional) An `int` count of seconds the event
+                           loop may be blocked before the worker is deemed
+                           stuck.
+    :param grace_period: (optional) An `int` count of seconds a stuck worker
+                         is given to stop gracefully before it is killed.
     """
 
-    def __init__(self, server: Server):
+    def __init__(
+        self,
+        server: Server,
+        keep_alive_timeout: int = 15,
+        worker_timeout: int = 60,
+        grace_period: int = 5,
+    ):
         super().__init__()
 
         self.server: Server = server
-        self.connections: set = self.server.connections
+        self.connections: ConnectionList = self.server.connections
+        self.daemon = True
 
-        self.keep_alive_timeout: int = self.server.server_limits.keep_alive_timeout
-        self.worker_timeout: int = self.server.server_limits.worker_timeout
+        self.keep_alive_timeout: int = keep_alive_timeout
+        self.worker_timeout: int = worker_timeout
+        self.grace_period: int = grace_period
 
         self.has_to_work: bool = True
+        self.wakeup: Event = Event()
+        self._idles_handle: TimerHandle = None
+        self._kill_deadline: float = None
 
-    def run(self):
-        count = 0
-        while self.has_to_work:
-            count += 1
-
-            self.server.current_time = datetime.time().isoformat()
-
-            if self.keep_alive_timeout > 0:
-                if count % self.keep_alive_timeout == 0:
-                    self._kill_idles()
+    def start(self):
+        """ Schedules the idle sweep on the loop and starts the thread. """
+        if self.keep_alive_timeout > 0:
+            self._idles_handle = self.server.loop.call_later(
+                self.keep_alive_timeout, self._kill_idles
+            )
 
-            if count % self.worker_timeout == 0:
-                self._check_worker()
+        super().start()
 
-            time.sleep(1)
-
-    def _check_connections(self):
-        """ Checks potentially stuck connections, hard-stops them. """
-        now = time.time()
-        for connection in self.server.connections.copy():
-            if (
-                connection.get_status() == STATUS_PROCESSING
-                and now - connection.get_last_task_time() >= self.worker_timeout
-            ):
-                os.kill(os.getpid(), signal.SIGKILL)
+    def run(self):
+        while self.has_to_work:
+            self._check_loop()
+            self.wakeup.wait(
+                max(1.0, self.server.now + self.worker_timeout - time.monotonic())
+            )
+
+    def stop(self):
+        """ Stops the `Reaper`, waking it if it is waiting for a check.
+
+        This should be called from the event loop's thread.
+        """
+        self.has_to_work = False
+        self.wakeup.set()
+
+        if self._idles_handle:
+            self._idles_handle.cancel()
+            self._idles_handle = None
+
+    def _check_loop(self):
+        """ Checks whether the event loop is stuck, stops the worker.
+
+        A stuck request blocks the event loop, which also stops `now` from
+        ticking, so the heartbeat is compared against the monotonic clock.
+
+        The worker is first sent `SIGTERM`, so that if the loop recovers it
+        shuts down gracefully and finishes its healthy connections. It is
+        only killed if it is still stuck once `grace_period` has passed.
+        """
+        now = time.monotonic()
+        if now - self.server.now < self.worker_timeout:
+            return
+
+        if self._kill_deadline is None:
+            os.kill(os.getpid(), signal.SIGTERM)
+            self._kill_deadline = now + self.grace_period
+        elif now >= self._kill_deadline:
+            os.kill(os.getpid(), signal.SIGKILL)
 
     def _kill_idles(self):
-        """ Checks potentially idle connections, soft-stops them. """
-        now = time.time()
-        for connection in self.connections.copy():
-            if connection.get_status() == STATUS_PENDING and (
-                now - connection.get_last_task_time() > self.keep_alive_timeout
-            ):
+        """ Checks potentially idle connections, soft-stops them.
+
+        The connections are ordered by last activity, so the sweep stops at
+        the first one that hasn't been idle for too long. The next sweep is
+        scheduled once this one is done.
+        """
+        now = self.server.now
+        for connection in self.connections:
+            if now - connection.last_task_time <= self.keep_alive_timeout:
+                break
+
+            if connection.status == STATUS_PENDING:
                 connection.stop()
 
+        if self.has_to_work:
+            self._idles_handle = self.server.loop.call_later(
+                self.keep_alive_timeout, self._kill_idles
+            )
+
     @staticmethod
     async def kill_connections(connections: list):
         for connection in connections:
@@ -0,0 +1,26 @@
+"""
+build
+~~~~~
+
+This module compiles Apodo's hot-path modules with Cython at build time.
+"""
+from Cython.Build import cythonize
+
+EXTENSIONS = ["apodo/net/connection.py"]
+
+
+def build(setup_kwargs: dict):
+    """ Adds the Cython extension modules to the package build.
+
+    The modules are compiled as-is, so that classes which subclass pure
+    Python base classes (like `asyncio` protocols) keep working, while
+    their method bodies run as compiled C. Annotations are not enforced as
+    C types, since they are hints only (e.g. optional arguments that may be
+    `None`), which Cython 3 would otherwise check at runtime.
+
+    :param setup_kwargs: The `dict` of keyword arguments passed to `setup`.
+    """
+    directives = {"language_level": 3, "annotation_typing": False}
+    setup_kwargs.update(
+        {"ext_modules": cythonize(EXTENSIONS, compiler_directives=directives)}
+    )
@@ -0,0 +1,104 @@
+from apodo.net.connection import ConnectionList
+
+
+class Node:
+    __slots__ = ("name", "_prev", "_next")
+
+    def __init__(self, name):
+        self.name = name
+        self._prev = None
+        self._next = None
+
+
+def make_list(*names):
+    connections = ConnectionList()
+    nodes = [Node(name) for name in names]
+    for node in nodes:
+        connections.add(node)
+
+    return connections, nodes
+
+
+def names(connections):
+    return [node.name for node in connections]
+
+
+def test_add_keeps_insertion_order():
+    connections, _ = make_list("a", "b", "c")
+
+    assert names(connections) == ["a", "b", "c"]
+    assert len(connections) == 3
+
+
+def test_double_add():
+    connections, (a, b) = make_list("a", "b")
+    connections.add(a)
+
+    assert names(connections) == ["a", "b"]
+    assert len(connections) == 2
+
+
+def test_touch_moves_to_end():
+    connections, (a, b, c) = make_list("a", "b", "c")
+
+    connections.touch(a)
+    assert names(connections) == ["b", "c", "a"]
+
+    connections.touch(c)
+    assert names(connections) == ["b", "a", "c"]
+
+    connections.touch(c)
+    assert names(connections) == ["b", "a", "c"]
+    assert len(connections) == 3
+
+
+def test_touch_missing():
+    connections, _ = make_list("a", "b")
+    connections.touch(Node("x"))
+
+    assert names(connections) == ["a", "b"]
+    assert len(connections) == 2
+
+
+def test_discard():
+    connections, (a, b, c) = make_list("a", "b", "c")
+    connections.discard(b)
+
+    assert names(connections) == ["a", "c"]
+    assert len(connections) == 2
+    assert b._prev is None and b._next is None
+
+    connections.add(b)
+    assert names(connections) == ["a", "c", "b"]
+
+
+def test_discard_missing():
+    connections, (a, b) = make_list("a", "b")
+    connections.discard(Node("x"))
+    connections.discard(a)
+    connections.discard(a)
+
+    assert names(connections) == ["b"]
+    assert len(connections) == 1
+
+
+def test_discard_current_during_iteration():
+    connections, _ = make_list("a", "b", "c", "d")
+    seen = []
+    for node in connections:
+        seen.append(node.name)
+        if node.name in ("a", "c"):
+            connections.discard(node)
+
+    assert seen == ["a", "b", "c", "d"]
+    assert names(connections) == ["b", "d"]
+    assert len(connections) == 2
+
+
+def test_discard_all_during_iteration():
+    connections, _ = make_list("a", "b", "c")
+    for node in connections:
+        connections.discard(node)
+
+    assert names(connections) == []
+    assert len(connections) == 0
@@ -0,0 +1,85 @@
+import time
+
+from apodo.net.headers import Headers
+
+
+def test_lookup_is_case_insensitive():
+    headers = Headers([(b"Content-Type", b"text/plain")])
+
+    assert headers["content-type"] == "text/plain"
+    assert headers[b"CONTENT-TYPE"] == "text/plain"
+    assert "Content-type" in headers
+    assert headers.content_type == b"text/plain"
+
+
+def test_duplicates_keep_first_value():
+    headers = Headers(
+        [
+            (b"X-Value", b"first"),
+            (b"x-value", b"second"),
+            (b"Content-Length", b"4"),
+            (b"Content-Length", b"10"),
+        ]
+    )
+
+    assert headers["x-value"] == "first"
+    assert headers.content_length == 4
+    assert len(headers) == 2
+    assert headers.dump() == {"x-value": "first", "content-length": "4"}
+
+
+def test_setitem_replaces_value():
+    headers = Headers([(b"Content-Length", b"4")])
+    headers["content-length"] = "10"
+    headers["X-New"] = b"new"
+
+    assert headers.content_length == 10
+    assert len(headers) == 2
+    assert headers.dump() == {"content-length": "10", "x-new": "new"}
+
+
+def test_get_default():
+    headers = Headers([(b"Host", b"localhost"), (b"X-Empty", b"")])
+
+    assert headers.get("host") == "localhost"
+    assert headers.get("missing") is None
+    assert headers.get("missing", "default") == "default"
+    assert headers.get("x-empty", "default") == "default"
+
+
+def test_no_cookies():
+    assert Headers().parse_cookies() == {}
+
+
+def test_parse_cookies():
+    headers = Headers([(b"Cookie", b"a=1; b=2=3;;c=")])
+
+    assert headers.parse_cookies() == {"a": "1", "b": "2=3", "c": ""}
+
+
+def test_parse_cookies_strips_spaces():
+    headers = Headers([(b"Cookie", b"  a = 1 ;  b=2 ")])
+
+    assert headers.parse_cookies() == {"a": "1", "b": "2"}
+
+
+def test_parse_cookies_skips_missing_equals():
+    headers = Headers([(b"Cookie", b"flag; a=1; other")])
+
+    assert headers.parse_cookies() == {"a": "1"}
+
+
+def test_parse_cookies_skips_empty_name():
+    headers = Headers([(b"Cookie", b"a=1; =v; =x=y;  = z")])
+
+    assert headers.parse_cookies() == {"a": "1"}
+
+
+def test_parse_cookies_long_whitespace():
+    headers = Headers([(b"Cookie", b"a=x" + b" " * 64000 + b"y; b" + b" " * 64000)])
+
+    start = time.monotonic()
+    cookies = headers.parse_cookies()
+
+    assert time.monotonic() - start < 0.5
+    assert cookies == {"a": "x" + " " * 64000 + "y"}
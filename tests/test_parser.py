@@ -0,0 +1,104 @@
+from apodo.util.constants import GET
+from apodo.util.parser import PARSE_ERROR
+from apodo.util.parser import PARSE_OK
+from apodo.util.parser import Parser
+
+
+class StubConnection:
+    def __init__(self):
+        self.parser = None
+        self.requests = []
+        self.keep_alive = []
+        self.body = b""
+        self.complete = 0
+
+    def on_headers_complete(self, headers, url, method):
+        self.requests.append((headers, url, method))
+        self.keep_alive.append(self.parser.should_keep_alive())
+
+    def on_body(self, body):
+        self.body += body
+
+    def on_message_complete(self):
+        self.complete += 1
+
+
+def make_parser():
+    connection = StubConnection()
+    connection.parser = Parser(connection)
+    return connection, connection.parser
+
+
+def test_feed_request():
+    connection, parser = make_parser()
+
+    result = parser.feed_data(
+        b"GET /path?a=1 HTTP/1.1\r\nHost: localhost\r\nContent-Length: 4\r\n\r\nbody"
+    )
+
+    assert result == PARSE_OK
+    assert connection.complete == 1
+    assert connection.body == b"body"
+    headers, url, method = connection.requests[0]
+    assert url == b"/path?a=1"
+    assert method is GET
+    assert headers.get("host") == "localhost"
+
+
+def test_feed_request_in_pieces():
+    connection, parser = make_parser()
+
+    for piece in (b"GET /pa", b"th HTTP/1.1\r\nHo", b"st: localhost\r\n", b"\r\n"):
+        assert parser.feed_data(memoryview(piece)) == PARSE_OK
+
+    assert connection.complete == 1
+    assert connection.requests[0][1] == b"/path"
+
+
+def test_feed_malformed():
+    connection, parser = make_parser()
+
+    assert parser.feed_data(b"NOT HTTP AT ALL\r\n\r\n") == PARSE_ERROR
+
+
+def test_feed_upgrade():
+    connection, parser = make_parser()
+
+    result = parser.feed_data(
+        b"GET /chat HTTP/1.1\r\nHost: localhost\r\n"
+        b"Connection: Upgrade\r\nUpgrade: websocket\r\n\r\n"
+        b"GET /next HTTP/1.1\r\nHost: localhost\r\n\r\n"
+    )
+
+    assert result == PARSE_OK
+    assert connection.complete == 2
+    assert [request[1] for request in connection.requests] == [b"/chat", b"/next"]
+    assert connection.keep_alive == [True, True]
+
+    assert parser.feed_data(b"GET /last HTTP/1.1\r\n\r\n") == PARSE_OK
+    assert connection.requests[-1][1] == b"/last"
+
+
+def test_feed_upgrade_with_body():
+    connection, parser = make_parser()
+
+    result = parser.feed_data(
+        b"POST /chat HTTP/1.1\r\nContent-Length: 4\r\n"
+        b"Connection: Upgrade, HTTP2-Settings\r\nUpgrade: h2c\r\n\r\nbody"
+    )
+
+    assert result == PARSE_ERROR
+
+
+def test_keep_alive():
+    requests = (
+        (b"GET / HTTP/1.1\r\n\r\n", True),
+        (b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n", False),
+        (b"GET / HTTP/1.1\r\nConnection: Close, TE\r\n\r\n", False),
+        (b"GET / HTTP/1.0\r\n\r\n", False),
+        (b"GET / HTTP/1.0\r\nConnection: keep-alive\r\n\r\n", True),
+    )
+    for request, keep_alive in requests:
+        connection, parser = make_parser()
+        assert parser.feed_data(request) == PARSE_OK
+        assert connection.keep_alive == [keep_alive]
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from apodo.util.exceptions import StreamAlreadyConsumed
+from apodo.util.stream import PREALLOCATION_LIMIT
+from apodo.util.stream import Stream
+
+
+class StubConnection:
+    def __init__(self, loop=None):
+        self.loop = loop
+        self.resumed = 0
+
+    def resume_reading(self):
+        self.resumed += 1
+
+
+def test_set_length_reserves_lazily():
+    stream = Stream(StubConnection())
+    stream.set_length(10 * PREALLOCATION_LIMIT)
+
+    assert len(stream.buffer) == 0
+
+    stream._put(b"abc")
+    assert len(stream.buffer) == PREALLOCATION_LIMIT
+    assert stream.size == 3
+
+    stream._put(b"x" * PREALLOCATION_LIMIT)
+    assert stream.size == PREALLOCATION_LIMIT + 3
+    assert stream.buffer[:4] == b"abcx"
+
+
+def test_set_length_small_body():
+    stream = Stream(StubConnection())
+    stream.set_length(5)
+    stream._put(b"ab")
+    stream._put(b"cde")
+
+    assert stream.buffer == b"abcde"
+
+
+def test_clear_resets_length():
+    stream = Stream(StubConnection())
+    stream.set_length(100)
+    stream._put(b"abc")
+    stream.end()
+    stream.clear()
+    stream._put(b"d")
+
+    assert stream.length is None
+    assert stream.buffer == b"d"
+    assert not stream.finished
+
+
+def test_read_waits_for_end():
+    async def scenario():
+        connection = StubConnection(asyncio.get_running_loop())
+        stream = Stream(connection)
+        stream.set_length(6)
+        stream._put(b"abc")
+
+        reader = asyncio.ensure_future(stream.read())
+        await asyncio.sleep(0)
+        assert stream.draining
+        assert not reader.done()
+        assert connection.resumed == 1
+
+        stream._put(b"def")
+        await asyncio.sleep(0)
+        assert not reader.done()
+
+        stream.end()
+        assert await reader == b"abcdef"
+        assert stream.consumed
+        assert stream.size == 0
+
+        with pytest.raises(StreamAlreadyConsumed):
+            await stream.read()
+
+    asyncio.run(scenario())
+
+
+def test_read_trims_buffer():
+    async def scenario():
+        stream = Stream(StubConnection(asyncio.get_running_loop()))
+        stream.set_length(100)
+        stream._put(b"abc")
+        stream.end()
+
+        assert await stream.read() == b"abc"
+
+    asyncio.run(scenario())
+
+
+def test_iterate_chunks():
+    async def scenario():
+        stream = Stream(StubConnection(asyncio.get_running_loop()))
+        stream._put(b"ab")
+        stream._put(b"c")
+        chunks = []
+
+        async def consume():
+            async for chunk in stream:
+                chunks.append(chunk)
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0)
+        assert chunks == [b"abc"]
+
+        stream._put(b"de")
+        await asyncio.sleep(0)
+        assert chunks == [b"abc", b"de"]
+
+        stream.end()
+        await consumer
+        assert stream.consumed
+
+        with pytest.raises(StreamAlreadyConsumed):
+            async for _ in stream:
+                pass
+
+    asyncio.run(scenario())
+
+
+def test_wake_without_waiter():
+    stream = Stream(StubConnection())
+    stream._put(b"abc")
+    stream.end()
+
+    assert stream._waiter is None
+    assert stream.finished
@@ -0,0 +1,66 @@
+from multiprocessing import cpu_count
+
+import pytest
+
+from apodo.util.constants import GET
+from apodo.util.constants import METHODS
+from apodo.util.utils import clean_methods
+from apodo.util.utils import default_workers
+from apodo.util.utils import RequestParams
+
+
+def test_request_params_get():
+    params = RequestParams({"a": ["1"], "b": ["2", "3"], "c": []})
+
+    assert params.get("a") == "1"
+    assert params.get("b") == "2"
+    assert params.get("c") is None
+    assert params.get("missing") is None
+
+
+def test_request_params_get_list():
+    params = RequestParams({"a": ["1"], "b": ["2", "3"]})
+
+    assert params.get_list("a") == ["1"]
+    assert params.get_list("b") == ["2", "3"]
+    assert params.get_list("missing") == []
+    assert params.get_list("missing", ["default"]) == ["default"]
+
+
+def test_request_params_dict_access():
+    params = RequestParams({"a": ["1"], "b": ["2", "3"]})
+
+    assert params["b"] == ["2", "3"]
+    assert list(params.keys()) == ["a", "b"]
+
+
+def test_clean_methods_interned():
+    post = b"".join([b"po", b"st"])
+    methods = clean_methods(["get", post, "Put"])
+
+    assert sorted(methods) == [b"GET", b"POST", b"PUT"]
+    for method in methods:
+        assert method is METHODS[method]
+
+
+def test_clean_methods_default():
+    methods = clean_methods(None)
+
+    assert methods == (GET,)
+    assert methods[0] is GET
+
+
+def test_default_workers(monkeypatch):
+    monkeypatch.delenv("APODO_WORKERS", raising=False)
+    assert default_workers() == cpu_count()
+
+    monkeypatch.setenv("APODO_WORKERS", " 3 ")
+    assert default_workers() == 3
+
+
+@pytest.mark.parametrize("value", ["auto", "0", "-2", "1.5"])
+def test_default_workers_invalid(monkeypatch, value):
+    monkeypatch.setenv("APODO_WORKERS", value)
+
+    with pytest.raises(ValueError, match="APODO_WORKERS"):
+        default_workers()